@@ -9,10 +9,14 @@ Version: v1.7
 import argparse
 import os
 import re
+import signal
 import subprocess
 import sys
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import List, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Tuple
 
 # Nagios exit codes
 STATE_OK = 0
@@ -29,13 +33,65 @@ MEDIA_ERROR_WARN = 1
 MEDIA_ERROR_CRIT = 10
 OTHER_ERROR_WARN = 1
 
+# Precompiled storcli output patterns
+RE_CTRL_STATUS = re.compile(r'Controller Status\s*:\s*(\S+)', re.IGNORECASE)
+RE_STATE = re.compile(r'(?:State|Status)\s*[:=]\s*(\S+)', re.IGNORECASE)
+RE_CV_STATE = re.compile(r'CacheVault.*?(?:State|Status)\s*[:=]\s*(\S+)', re.IGNORECASE)
+RE_BBU_STATE = re.compile(r'(?:BBU|Battery).*?(?:State|Status)\s*[:=]\s*(\S+)', re.IGNORECASE)
+RE_EP_PRESENT = re.compile(r'Energy Pack\s*=\s*(\S+)', re.IGNORECASE)
+RE_EP_STATUS = re.compile(r'Energy Pack Status\s*=\s*(\S+)', re.IGNORECASE)
+RE_FOREIGN_ROW = re.compile(r'^[0-9]+', re.MULTILINE)
+RE_SSD_ID = re.compile(r'^(\d+:\d+).*SSD', re.MULTILINE | re.IGNORECASE)
+RE_PREDICTIVE_COUNT = re.compile(r'Predictive Failure Count\D*(\d+)', re.IGNORECASE)
+RE_DRIVE_HEADER = re.compile(r'^(?:Drive\s+)?(\d+:\d+)\b', re.MULTILINE)
+RE_PD_LINE = re.compile(r'^(\d+:\d+)\s+\d+\s+(\S+)', re.MULTILINE)
+RE_DRIVE_COUNTERS = re.compile(
+    r'(?P<media>Media Error.*?(?P<media_n>\d+))|(?P<other>Other Error.*?(?P<other_n>\d+))|'
+    r'(?P<shield>Shield Counter.*?(?P<shield_n>\d+))|(?P<bbm>BBM Error.*?(?P<bbm_n>\d+))',
+    re.IGNORECASE
+)
+RE_WEAR = re.compile(r'(Life Left|Wear|Wearout).*?(\d+)', re.IGNORECASE)
+RE_TEMP = re.compile(r'(?:Drive\s+)?Temperature.*?(\d+)', re.IGNORECASE)
+RE_PROGRESS = re.compile(r'Progress.*?(\d+)%', re.IGNORECASE)
+RE_PERCENT = re.compile(r'(\d+)%')
+RE_PR_STATE = re.compile(r'State\s*:\s*(\S+)', re.IGNORECASE)
+RE_VD_LINE = re.compile(r'^(\d+)/(\d+)\s+(RAID\S*)\s+(\S+).*?(\S+)\s*$', re.MULTILINE)
+
+# Nagios perfdata (keys are relied on by graphing; keep stable)
+PERF_TEMPLATE = (
+    "| vd_total={s.vd_total} vd_ok={s.vd_ok} vd_warn={s.vd_warn} vd_crit={s.vd_crit} "
+    "pd_total={s.pd_total} pd_ok={s.pd_ok} pd_warn={s.pd_warn} pd_crit={s.pd_crit} "
+    "spares={s.spare_count} max_temp={s.max_temp}C media_errors={s.media_errors} "
+    "other_errors={s.other_errors}"
+)
+
+# Status words (lowercase) for controller, CacheVault/BBU, Energy Pack and patrol read
+OK_STATES = frozenset({'optimal', 'ok', 'good'})
+ACTIVE_STATES = frozenset({'active', 'running'})
+STOPPED_STATES = frozenset({'stopped', 'paused'})
+PRESENT_STATES = frozenset({'present', 'yes'})
+ABSENT_STATES = frozenset({'absent', 'no'})
+
+# storcli state -> perfdata bucket (VD states not listed count as critical)
+VD_STATE_BUCKET = {'Optl': 'ok', 'Rbld': 'warn', 'Pdgd': 'warn'}
+PD_STATE_BUCKET = {
+    'Onln': 'ok', 'Rbld': 'warn',
+    'Offln': 'crit', 'Failed': 'crit', 'UBad': 'crit', 'Msng': 'crit',
+}
+
+# Concurrent storcli queries per run
+PREFETCH_WORKERS = 8
+
 STORCLI_PATH = "/opt/MegaRAID/storcli/storcli64"
 ENABLE_PERFDATA = os.getenv("ENABLE_PERFDATA", "0").lower() in ("1", "true", "yes")
 ENABLE_LONG_OUTPUT = os.getenv("ENABLE_LONG_OUTPUT", "0").lower() in ("1", "true", "yes")
 TERSE_OUTPUT = os.getenv("TERSE_OUTPUT", "1").lower() in ("1", "true", "yes")
 
+# dataclass(slots=True) needs Python 3.10+; older interpreters keep a per-instance __dict__
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class RaidStatus:
     """Container for RAID status data"""
     vd_total: int = 0
@@ -67,33 +123,90 @@ class LocalStorCLIRunner:
     def __init__(self, timeout: int = 60, controller: str = "0"):
         self.timeout = timeout
         self.controller = controller
+        self._prefix = [STORCLI_PATH]
 
     def run(self, cmd: str) -> Tuple[str, int]:
         """Run a storcli command and return output and exit code"""
         try:
-            full_cmd = [STORCLI_PATH] + cmd.split()
+            full_cmd = self._prefix + cmd.split()
             result = subprocess.run(
                 full_cmd,
                 capture_output=True,
-                text=True,
                 timeout=self.timeout
             )
-            return result.stdout + result.stderr, result.returncode
+            output = (result.stdout + result.stderr).decode("utf-8", errors="replace")
+            return output, result.returncode
         except subprocess.TimeoutExpired:
             return f"Timeout after {self.timeout}s", 124
         except Exception as e:
             return str(e), 1
 
+    def run_lines(self, cmd: str, parser: Callable[[Iterable[str]], Any]) -> Tuple[Any, int]:
+        """Run a storcli command, feeding output lines to parser as they arrive"""
+        try:
+            proc = subprocess.Popen(
+                self._prefix + cmd.split(),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                encoding="utf-8",
+                errors="replace",
+                bufsize=1,
+                start_new_session=True
+            )
+        except Exception as e:
+            return parser([str(e)]), 1
+        timed_out = threading.Event()
+
+        def kill():
+            # Flag first, then take down the whole group so no forked child keeps the pipe open
+            timed_out.set()
+            try:
+                os.killpg(proc.pid, signal.SIGKILL)
+            except OSError:
+                pass
+
+        timer = threading.Timer(self.timeout, kill)
+        timer.start()
+        try:
+            with proc:
+                parsed = parser(proc.stdout)
+        finally:
+            timer.cancel()
+        if timed_out.is_set():
+            return parser([f"Timeout after {self.timeout}s"]), 124
+        return parsed, proc.returncode
+
+
+_STATUS_TRANSLATIONS = {
+    'Optl': 'Optimal', 'Dgrd': 'Degraded', 'Rbld': 'Rebuilding',
+    'Offln': 'Offline', 'OfLn': 'Offline', 'Pdgd': 'Partially Degraded',
+    'Rec': 'Recovering', 'Failed': 'Failed', 'Msng': 'Missing',
+    'Onln': 'Online', 'UBad': 'Unconfigured Bad',
+}
+
 
 def translate_status(status: str) -> str:
     """Translate storcli status codes to readable names"""
-    translations = {
-        'Optl': 'Optimal', 'Dgrd': 'Degraded', 'Rbld': 'Rebuilding',
-        'Offln': 'Offline', 'OfLn': 'Offline', 'Pdgd': 'Partially Degraded',
-        'Rec': 'Recovering', 'Failed': 'Failed', 'Msng': 'Missing',
-        'Onln': 'Online', 'UBad': 'Unconfigured Bad',
-    }
-    return translations.get(status, status)
+    return _STATUS_TRANSLATIONS.get(status, status)
+
+
+def parse_pd_all(lines: Iterable[str]) -> Dict[str, str]:
+    """Group storcli 'show all' output lines into per-drive sections keyed by EID:Slt"""
+    sections = {}
+    drive = None
+    body = []
+    for line in lines:
+        match = RE_DRIVE_HEADER.match(line)
+        if match:
+            if drive is not None:
+                sections.setdefault(drive, "\n".join(body))
+            drive = match.group(1)
+            body = [line[match.end():].rstrip("\n")]
+        elif drive is not None:
+            body.append(line.rstrip("\n"))
+    if drive is not None:
+        sections.setdefault(drive, "\n".join(body))
+    return sections
 
 
 class RaidChecker:
@@ -104,13 +217,55 @@ class RaidChecker:
         self.vd_num = vd_num
         self.status = RaidStatus()
         self.vd_output = ""
+        self.vd_records = []
         self.pd_output = ""
+        self.drive_sections = {}
+        self._results = {}
+
+    def _prefetch(self):
+        """Run the storcli queries concurrently and keep their results by name
+
+        Plain queries hold (output, exit code). Gated follow-ups are chained in
+        the same pool: 'rebuild' runs once the VD list shows a rebuild, and
+        'cv'/'bbu' hold the first State/Status match of their fallback chain.
+        """
+        ctrl = f"/c{self.runner.controller}"
+        commands = {
+            'vd': f"{ctrl}/vall show",
+            'pd': f"{ctrl}/eall/sall show",
+            'ctrl': f"{ctrl} show",
+            'foreign': f"{ctrl}/fall show",
+            'patrol': f"{ctrl} show patrolread",
+            'cc': f"{ctrl}/vall show cc",
+        }
+        cv_cmds = [f"{ctrl}/cv show", f"cv show -i {self.runner.controller}"]
+        bbu_cmds = [f"{ctrl}/bbu show", f"bbu show -i {self.runner.controller}"]
+        with ThreadPoolExecutor(max_workers=PREFETCH_WORKERS) as executor:
+            # The drive detail listing is the largest response; start it first
+            futures = {'pd_all': executor.submit(
+                self.runner.run_lines, f"{ctrl}/eall/sall show all", parse_pd_all
+            )}
+            for name, cmd in commands.items():
+                futures[name] = executor.submit(self.runner.run, cmd)
+            futures['rebuild'] = executor.submit(self._fetch_rebuild, futures['vd'])
+            futures['cv'] = executor.submit(self._query_state, cv_cmds)
+            futures['bbu'] = executor.submit(self._query_state, bbu_cmds)
+            self._results = {name: future.result() for name, future in futures.items()}
+
+    def _fetch_rebuild(self, vd_future) -> Tuple[str, int]:
+        """Fetch rebuild progress once the VD list arrives, only if a VD is rebuilding"""
+        vd_output, _ = vd_future.result()
+        if ' Rbld ' not in vd_output:
+            return "", 0
+        return self.runner.run(f"/c{self.runner.controller}/vall show rebuild")
 
     def check_all(self) -> Tuple[int, str]:
         """Run all checks and return exit code and message"""
-        ctrl = f"/c{self.runner.controller}"
-        self.vd_output, _ = self.runner.run(f"{ctrl}/vall show")
-        self.pd_output, _ = self.runner.run(f"{ctrl}/eall/sall show")
+        self._prefetch()
+        self.vd_output, _ = self._results['vd']
+        self.vd_records = RE_VD_LINE.findall(self.vd_output)
+        self.pd_output, _ = self._results['pd']
+        self.drive_sections, _ = self._results['pd_all']
 
         self.check_controller_health()
         self.check_battery()
@@ -124,61 +279,50 @@ class RaidChecker:
         self.check_patrol_read()
         self.check_hotspare()
         self.build_perfdata()
-        if ENABLE_LONG_OUTPUT:
-            self.build_long_output()
 
         return self.evaluate_status()
 
     def check_controller_health(self):
-        ctrl = f"/c{self.runner.controller}"
-        output, _ = self.runner.run(f"{ctrl} show")
-        match = re.search(r'Controller Status\s*:\s*(\S+)', output, re.IGNORECASE)
+        output, _ = self._results['ctrl']
+        match = RE_CTRL_STATUS.search(output)
         if match:
             state = match.group(1)
-            if re.match(r'(Optimal|OK|Good)', state, re.IGNORECASE):
+            if state.lower() in OK_STATES:
                 self.status.ctrl_status = "Controller:OK"
             else:
                 self.status.ctrl_status = f"Controller:{state}"
                 self.status.warnings.append(f"Controller status: {state}")
 
+    def _query_state(self, cmds: List[str]):
+        """Run cmds in order until one reports a State/Status and return that match"""
+        for cmd in cmds:
+            output, _ = self.runner.run(cmd)
+            match = None if "unsupported command" in output.lower() else RE_STATE.search(output)
+            if match:
+                return match
+        return None
+
     def check_battery(self):
         ctrl = f"/c{self.runner.controller}"
-        cv_output, _ = self.runner.run(f"{ctrl}/cv show")
-        match = None if "unsupported command" in cv_output.lower() else re.search(
-            r'(?:State|Status)\s*[:=]\s*(\S+)', cv_output, re.IGNORECASE
-        )
-        if not match:
-            alt_output, _ = self.runner.run(f"cv show -i {self.runner.controller}")
-            match = None if "unsupported command" in alt_output.lower() else re.search(
-                r'(?:State|Status)\s*[:=]\s*(\S+)', alt_output, re.IGNORECASE
-            )
+        # '/cN show' is already prefetched for the controller health check
+        ctrl_output, _ = self._results['ctrl']
+        match = self._results['cv']
         if not match:
-            ctrl_output, _ = self.runner.run(f"{ctrl} show")
-            match = re.search(r'CacheVault.*?(?:State|Status)\s*[:=]\s*(\S+)', ctrl_output, re.IGNORECASE)
+            match = RE_CV_STATE.search(ctrl_output)
         if match:
             state = match.group(1)
-            if re.match(r'(Optimal|Good)', state, re.IGNORECASE):
+            if state.lower() in OK_STATES:
                 self.status.battery_status = "CV:OK"
             else:
                 self.status.battery_status = f"CV:{state}"
-                if not re.match(r'(Optimal|Good)', state, re.IGNORECASE):
-                    self.status.warnings.append(f"CacheVault {state}")
+                self.status.warnings.append(f"CacheVault {state}")
 
-        bbu_output, _ = self.runner.run(f"{ctrl}/bbu show")
-        match = None if "unsupported command" in bbu_output.lower() else re.search(
-            r'(?:State|Status)\s*[:=]\s*(\S+)', bbu_output, re.IGNORECASE
-        )
+        match = self._results['bbu']
         if not match:
-            alt_output, _ = self.runner.run(f"bbu show -i {self.runner.controller}")
-            match = None if "unsupported command" in alt_output.lower() else re.search(
-                r'(?:State|Status)\s*[:=]\s*(\S+)', alt_output, re.IGNORECASE
-            )
-        if not match:
-            ctrl_output, _ = self.runner.run(f"{ctrl} show")
-            match = re.search(r'(?:BBU|Battery).*?(?:State|Status)\s*[:=]\s*(\S+)', ctrl_output, re.IGNORECASE)
+            match = RE_BBU_STATE.search(ctrl_output)
         if match:
             state = match.group(1)
-            if re.match(r'(Optimal|Good|OK)', state, re.IGNORECASE):
+            if state.lower() in OK_STATES:
                 bbu_status = "BBU:OK"
             else:
                 bbu_status = f"BBU:{state}"
@@ -189,111 +333,99 @@ class RaidChecker:
                 self.status.battery_status = bbu_status
 
         if not self.status.battery_status:
-            ctrl_output, _ = self.runner.run(f"{ctrl} show all")
-            ep_present = re.search(r'Energy Pack\s*=\s*(\S+)', ctrl_output, re.IGNORECASE)
-            ep_status = re.search(r'Energy Pack Status\s*=\s*(\S+)', ctrl_output, re.IGNORECASE)
+            all_output, _ = self.runner.run(f"{ctrl} show all")
+            ep_present = RE_EP_PRESENT.search(all_output)
+            ep_status = RE_EP_STATUS.search(all_output)
             present_val = ep_present.group(1) if ep_present else ""
             status_val = ep_status.group(1) if ep_status else ""
             if present_val or status_val:
-                if re.match(r'(Present|Yes)', present_val, re.IGNORECASE):
-                    if not status_val or status_val == "0" or re.match(r'(OK|Optimal|Good)', status_val, re.IGNORECASE):
+                if present_val.lower() in PRESENT_STATES:
+                    if not status_val or status_val == "0" or status_val.lower() in OK_STATES:
                         self.status.battery_status = "Cache:OK Battery:OK"
                     else:
                         self.status.battery_status = f"Cache:EP{status_val} Battery:EP{status_val}"
                         self.status.warnings.append(f"Energy Pack status {status_val}")
-                elif re.match(r'(Absent|No)', present_val, re.IGNORECASE):
+                elif present_val.lower() in ABSENT_STATES:
                     self.status.warnings.append("Energy Pack Absent")
 
     def check_foreign_config(self):
-        ctrl = f"/c{self.runner.controller}"
-        output, _ = self.runner.run(f"{ctrl}/fall show")
-        if re.search(r'foreign configuration|DG', output, re.IGNORECASE):
-            foreign_count = len(re.findall(r'^[0-9]+', output, re.MULTILINE))
-            if foreign_count > 0:
-                self.status.warnings.append(f"Foreign config detected ({foreign_count})")
+        output, _ = self._results['foreign']
+        lowered = output.lower()
+        if 'dg' not in lowered and 'foreign configuration' not in lowered:
+            return
+        foreign_count = len(RE_FOREIGN_ROW.findall(output))
+        if foreign_count > 0:
+            self.status.warnings.append(f"Foreign config detected ({foreign_count})")
 
     def check_predictive_failure(self):
-        ctrl = f"/c{self.runner.controller}"
-        output, _ = self.runner.run(f"{ctrl}/eall/sall show all")
-        if re.search(r'Predictive.*Yes', output, re.IGNORECASE):
-            pred_drives = []
-            for match in re.finditer(r'(\d+:\d+).*?Predictive.*?Yes', output, re.IGNORECASE | re.DOTALL):
-                pred_drives.append(match.group(1))
-            if pred_drives:
-                self.status.warnings.append(f"Predictive failure on: {', '.join(pred_drives)}")
+        pred_drives = []
+        for drive, section in self.drive_sections.items():
+            lowered = section.lower()
+            if 'predictive' not in lowered:
+                continue
+            for line in lowered.splitlines():
+                pos = line.find('predictive')
+                if pos < 0:
+                    continue
+                count_match = RE_PREDICTIVE_COUNT.search(line, pos)
+                if (count_match and int(count_match.group(1)) > 0) or 'yes' in line[pos:]:
+                    pred_drives.append(drive)
+                    break
+        if pred_drives:
+            self.status.warnings.append(f"Predictive failure on: {', '.join(pred_drives)}")
 
     def check_smart_data(self):
-        ctrl = f"/c{self.runner.controller}"
-        output, _ = self.runner.run(f"{ctrl}/eall/sall show all")
-        pd_list = re.findall(r'^(\d+:\d+)', self.pd_output, re.MULTILINE)
-
-        for drive in pd_list:
-            pattern = rf'(Drive\s+{re.escape(drive)}|^{re.escape(drive)}).*?(?=Drive\s+\d+:\d+|$)'
-            match = re.search(pattern, output, re.IGNORECASE | re.DOTALL)
-            if not match:
-                continue
-            section = match.group(0)
-
-            media_match = re.search(r'Media Error.*?(\d+)', section, re.IGNORECASE)
-            if media_match:
-                count = int(media_match.group(1))
-                if count > 0:
-                    self.status.media_errors += count
-                    if count >= MEDIA_ERROR_CRIT:
-                        self.status.critical_warnings.append(f"Drive {drive}: {count} media errors")
-                    elif count >= MEDIA_ERROR_WARN:
-                        self.status.warnings.append(f"Drive {drive}: {count} media errors")
-
-            other_match = re.search(r'Other Error.*?(\d+)', section, re.IGNORECASE)
-            if other_match:
-                count = int(other_match.group(1))
-                if count > 0:
-                    self.status.other_errors += count
-                    if count >= OTHER_ERROR_WARN:
-                        self.status.warnings.append(f"Drive {drive}: {count} other errors")
-
-            shield_match = re.search(r'Shield Counter.*?(\d+)', section, re.IGNORECASE)
-            if shield_match:
-                count = int(shield_match.group(1))
-                if count > 0:
-                    self.status.warnings.append(f"Drive {drive}: {count} shield errors")
-
-            bbm_match = re.search(r'BBM Error.*?(\d+)', section, re.IGNORECASE)
-            if bbm_match:
-                count = int(bbm_match.group(1))
-                if count > 0:
-                    self.status.warnings.append(f"Drive {drive}: {count} BBM errors")
+        for drive, section in self.drive_sections.items():
+            counters = {}
+            for match in RE_DRIVE_COUNTERS.finditer(section):
+                # First value per counter wins
+                counters.setdefault(match.lastgroup, int(match.group(match.lastgroup + '_n')))
+
+            count = counters.get('media', 0)
+            if count > 0:
+                self.status.media_errors += count
+                if count >= MEDIA_ERROR_CRIT:
+                    self.status.critical_warnings.append(f"Drive {drive}: {count} media errors")
+                elif count >= MEDIA_ERROR_WARN:
+                    self.status.warnings.append(f"Drive {drive}: {count} media errors")
+
+            count = counters.get('other', 0)
+            if count > 0:
+                self.status.other_errors += count
+                if count >= OTHER_ERROR_WARN:
+                    self.status.warnings.append(f"Drive {drive}: {count} other errors")
+
+            count = counters.get('shield', 0)
+            if count > 0:
+                self.status.warnings.append(f"Drive {drive}: {count} shield errors")
+
+            count = counters.get('bbm', 0)
+            if count > 0:
+                self.status.warnings.append(f"Drive {drive}: {count} BBM errors")
 
     def check_rebuild_progress(self):
         if ' Rbld ' in self.vd_output:
-            ctrl = f"/c{self.runner.controller}"
-            output, _ = self.runner.run(f"{ctrl}/vall show rebuild")
-            match = re.search(r'Progress.*?(\d+)%', output, re.IGNORECASE)
+            output, _ = self._results['rebuild']
+            match = RE_PROGRESS.search(output)
             if match:
                 self.status.rebuild_status = f"Rebuild:{match.group(1)}%"
             else:
                 self.status.rebuild_status = "Rebuild:InProgress"
 
     def check_consistency_check(self):
-        ctrl = f"/c{self.runner.controller}"
-        output, _ = self.runner.run(f"{ctrl}/vall show cc")
-        if re.search(r'\d+%|in progress', output, re.IGNORECASE):
-            match = re.search(r'(\d+)%', output)
-            if match:
-                self.status.cc_status = f"CC:{match.group(1)}%"
-            else:
-                self.status.cc_status = "CC:Running"
+        output, _ = self._results['cc']
+        match = RE_PERCENT.search(output) if '%' in output else None
+        if match:
+            self.status.cc_status = f"CC:{match.group(1)}%"
+        elif 'in progress' in output.lower():
+            self.status.cc_status = "CC:Running"
 
     def check_ssd_wear(self):
-        ctrl = f"/c{self.runner.controller}"
-        output, _ = self.runner.run(f"{ctrl}/eall/sall show all")
-        ssd_drives = re.findall(r'^(\d+:\d+).*SSD', self.pd_output, re.MULTILINE | re.IGNORECASE)
+        ssd_drives = RE_SSD_ID.findall(self.pd_output)
         for drive in ssd_drives:
-            pattern = rf'Drive\s+{re.escape(drive)}.*?(?=Drive\s+\d+:\d+|$)'
-            match = re.search(pattern, output, re.IGNORECASE | re.DOTALL)
-            if match:
-                section = match.group(0)
-                wear_match = re.search(r'(Life Left|Wear|Wearout).*?(\d+)', section, re.IGNORECASE)
+            section = self.drive_sections.get(drive)
+            if section:
+                wear_match = RE_WEAR.search(section)
                 if wear_match:
                     remaining = int(wear_match.group(2))
                     if remaining <= SSD_WEAR_CRIT:
@@ -302,37 +434,35 @@ class RaidChecker:
                         self.status.warnings.append(f"SSD {drive} wear warning ({remaining}% left)")
 
     def check_drive_temperature(self):
-        ctrl = f"/c{self.runner.controller}"
-        output, _ = self.runner.run(f"{ctrl}/eall/sall show all")
-        temps = re.findall(r'(?:Drive\s+)?Temperature.*?(\d+)', output, re.IGNORECASE)
-        for temp_str in temps:
-            temp = int(temp_str)
-            if 0 < temp < 100:
-                if temp > self.status.max_temp:
-                    self.status.max_temp = temp
-                if temp >= TEMP_CRIT:
-                    self.status.critical_warnings.append(f"Drive overheating ({temp}C)")
-                elif temp >= TEMP_WARN:
-                    self.status.warnings.append(f"Drive temperature high ({temp}C)")
+        for section in self.drive_sections.values():
+            for temp_str in RE_TEMP.findall(section):
+                temp = int(temp_str)
+                if 0 < temp < 100:
+                    if temp > self.status.max_temp:
+                        self.status.max_temp = temp
+                    if temp >= TEMP_CRIT:
+                        self.status.critical_warnings.append(f"Drive overheating ({temp}C)")
+                    elif temp >= TEMP_WARN:
+                        self.status.warnings.append(f"Drive temperature high ({temp}C)")
 
     def check_patrol_read(self):
-        ctrl = f"/c{self.runner.controller}"
-        output, _ = self.runner.run(f"{ctrl} show patrolread")
-        match = re.search(r'State\s*:\s*(\S+)', output, re.IGNORECASE)
+        output, _ = self._results['patrol']
+        match = RE_PR_STATE.search(output)
         if match:
             state = match.group(1)
-            if re.match(r'(Active|Running)', state, re.IGNORECASE):
-                progress_match = re.search(r'Progress.*?(\d+)%', output, re.IGNORECASE)
+            if state.lower() in ACTIVE_STATES:
+                progress_match = RE_PROGRESS.search(output)
                 if progress_match:
                     self.status.patrol_status = f"PR:{progress_match.group(1)}%"
                 else:
                     self.status.patrol_status = "PR:Running"
-            elif re.match(r'(Stopped|Paused)', state, re.IGNORECASE):
+            elif state.lower() in STOPPED_STATES:
                 self.status.patrol_status = "PR:Stopped"
 
     def check_hotspare(self):
-        spare_ok = len(re.findall(r'(DHS|GHS)', self.pd_output, re.IGNORECASE))
-        ugood_count = len(re.findall(r'UGood', self.pd_output, re.IGNORECASE))
+        # storcli prints these state codes with fixed casing
+        spare_ok = self.pd_output.count('DHS') + self.pd_output.count('GHS')
+        ugood_count = self.pd_output.count('UGood')
         self.status.spare_count = spare_ok
         if spare_ok > 0:
             self.status.hotspare_status = f"Spares:{spare_ok}"
@@ -344,31 +474,20 @@ class RaidChecker:
                 self.status.warnings.append("No hot spares configured")
 
     def build_perfdata(self):
-        vd_lines = re.findall(r'^(\d+/\d+)\s+RAID\S*\s+(\S+)', self.vd_output, re.MULTILINE)
-        self.status.vd_total = len(vd_lines)
-        for vd_id, state in vd_lines:
-            if state == 'Optl':
-                self.status.vd_ok += 1
-            elif state in ('Rbld', 'Pdgd'):
-                self.status.vd_warn += 1
-            else:
-                self.status.vd_crit += 1
-
-        pd_lines = re.findall(r'^(\d+:\d+)\s+\d+\s+(\S+)', self.pd_output, re.MULTILINE)
-        self.status.pd_total = len(pd_lines)
-        for pd_id, state in pd_lines:
-            if state == 'Onln':
-                self.status.pd_ok += 1
-            elif state == 'Rbld':
-                self.status.pd_warn += 1
-            elif state in ('Offln', 'Failed', 'UBad', 'Msng'):
-                self.status.pd_crit += 1
+        s = self.status
+        vd_counts = Counter(VD_STATE_BUCKET.get(state, 'crit') for c, v, r, state, n in self.vd_records)
+        s.vd_total = len(self.vd_records)
+        s.vd_ok, s.vd_warn, s.vd_crit = vd_counts['ok'], vd_counts['warn'], vd_counts['crit']
+
+        pd_lines = RE_PD_LINE.findall(self.pd_output)
+        pd_counts = Counter(PD_STATE_BUCKET.get(state) for pd_id, state in pd_lines)
+        s.pd_total = len(pd_lines)
+        s.pd_ok, s.pd_warn, s.pd_crit = pd_counts['ok'], pd_counts['warn'], pd_counts['crit']
 
     def build_long_output(self):
         self.status.long_output.append("--- Virtual Drives ---")
-        for match in re.finditer(r'^(\d+/\d+)\s+(RAID\S*)\s+(\S+).*?(\S+)\s*$', self.vd_output, re.MULTILINE):
-            vd_id, raid_type, state, name = match.groups()
-            self.status.long_output.append(f"VD{vd_id}: {raid_type} {state} ({name})")
+        for ctrl_id, vd_id, raid_type, state, name in self.vd_records:
+            self.status.long_output.append(f"VD{ctrl_id}/{vd_id}: {raid_type} {state} ({name})")
         self.status.long_output.append("")
         self.status.long_output.append("--- Status ---")
         if self.status.ctrl_status:
@@ -392,24 +511,23 @@ class RaidChecker:
 
     def evaluate_status(self) -> Tuple[int, str]:
         s = self.status
-        perfdata = (f"| vd_total={s.vd_total} vd_ok={s.vd_ok} vd_warn={s.vd_warn} "
-                    f"vd_crit={s.vd_crit} pd_total={s.pd_total} pd_ok={s.pd_ok} "
-                    f"pd_warn={s.pd_warn} pd_crit={s.pd_crit} spares={s.spare_count} "
-                    f"max_temp={s.max_temp}C media_errors={s.media_errors} "
-                    f"other_errors={s.other_errors}")
-        perf_suffix = f" {perfdata}" if ENABLE_PERFDATA else ""
-        long_out = "\n" + "\n".join(s.long_output) if ENABLE_LONG_OUTPUT and s.long_output else ""
-
-        vd_lines = re.findall(r'^(\d+)/(\d+)\s+RAID\S*\s+(\S+).*?(\S+)\s*$', self.vd_output, re.MULTILINE)
+        vd_lines = self.vd_records
 
         if self.vd_num:
-            vd_lines = [(c, v, st, n) for c, v, st, n in vd_lines if v == self.vd_num]
+            vd_lines = [(c, v, r, st, n) for c, v, r, st, n in vd_lines if v == self.vd_num]
             if not vd_lines:
                 return STATE_CRITICAL, f"RAID CRITICAL - Virtual Drive {self.vd_num} not found"
 
-        non_optimal = [(c, v, st, n) for c, v, st, n in vd_lines if st != 'Optl']
+        perf_suffix = f" {PERF_TEMPLATE.format(s=s)}" if ENABLE_PERFDATA else ""
+        long_out = ""
+        if ENABLE_LONG_OUTPUT:
+            self.build_long_output()
+            long_out = "\n" + "\n".join(s.long_output)
+        tail = f"{perf_suffix}{long_out}"
+
+        non_optimal = [(c, v, r, st, n) for c, v, r, st, n in vd_lines if st != 'Optl']
         if non_optimal:
-            ctrl_id, vd_id, state, name = non_optimal[0]
+            ctrl_id, vd_id, raid_type, state, name = non_optimal[0]
             readable = translate_status(state)
             rebuild_info = f" [{s.rebuild_status}]" if s.rebuild_status else ""
             if state in ('Rbld', 'Pdgd'):
@@ -417,31 +535,31 @@ class RaidChecker:
                     msg = f"RAID WARNING (MegaRAID) - VD{vd_id} {readable}"
                 else:
                     msg = f"RAID WARNING (MegaRAID) - VD{vd_id} ({name}) Status: {readable}{rebuild_info}"
-                return STATE_WARNING, f"{msg}{perf_suffix}{long_out}"
+                return STATE_WARNING, msg + tail
             else:
                 if TERSE_OUTPUT:
                     msg = f"RAID CRITICAL (MegaRAID) - VD{vd_id} {readable}"
                 else:
                     msg = f"RAID CRITICAL (MegaRAID) - VD{vd_id} ({name}) Status: {readable}"
-                return STATE_CRITICAL, f"{msg}{perf_suffix}{long_out}"
+                return STATE_CRITICAL, msg + tail
 
         if s.critical_warnings:
             crit_msg = "; ".join(s.critical_warnings)
             if TERSE_OUTPUT:
                 msg = f"RAID CRITICAL (MegaRAID) - {crit_msg}"
             else:
-                vd_info = ", ".join([f"VD{v}:Optimal" for c, v, st, n in vd_lines])
+                vd_info = ", ".join([f"VD{v}:Optimal" for c, v, r, st, n in vd_lines])
                 msg = f"RAID CRITICAL (MegaRAID) - VDs Optimal but: {crit_msg} ({vd_info})"
-            return STATE_CRITICAL, f"{msg}{perf_suffix}{long_out}"
+            return STATE_CRITICAL, msg + tail
 
         if s.warnings:
             warn_msg = "; ".join(s.warnings)
             if TERSE_OUTPUT:
                 msg = f"RAID WARNING (MegaRAID) - {warn_msg}"
             else:
-                vd_info = ", ".join([f"VD{v}:Optimal" for c, v, st, n in vd_lines])
+                vd_info = ", ".join([f"VD{v}:Optimal" for c, v, r, st, n in vd_lines])
                 msg = f"RAID WARNING (MegaRAID) - VDs Optimal but: {warn_msg} ({vd_info})"
-            return STATE_WARNING, f"{msg}{perf_suffix}{long_out}"
+            return STATE_WARNING, msg + tail
 
         extra = []
         if s.battery_status:
@@ -467,10 +585,10 @@ class RaidChecker:
             if self.vd_num:
                 msg = f"RAID OK (MegaRAID) - VD{self.vd_num} Status: Optimal{extra_str}"
             else:
-                vd_info = ", ".join([f"VD{v}:Optimal" for c, v, st, n in vd_lines])
+                vd_info = ", ".join([f"VD{v}:Optimal" for c, v, r, st, n in vd_lines])
                 msg = f"RAID OK (MegaRAID) - All {s.vd_total} Virtual Drives Optimal ({vd_info}){extra_str}"
 
-        return STATE_OK, f"{msg}{perf_suffix}{long_out}"
+        return STATE_OK, msg + tail
 
 
 def main():